@@ -1,23 +1,72 @@
-"""Vercel serverless handler for Scholarship Application Tracker."""
+"""Vercel serverless handler for Scholarship Application Tracker.
 
+The page, stats.json and data.json are prebuilt by build_static.py and served statically;
+this function handles /search, the exports, /metrics.json and /revalidate. Deep links such as
+/?q=... get the static page, whose script applies the query.
+"""
+
+import hmac
+import json
 import sys
+import urllib.request
 from http.server import BaseHTTPRequestHandler
 from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
 
 _root = Path(__file__).resolve().parent.parent
 if str(_root) not in sys.path:
     sys.path.insert(0, str(_root))
 
-from sheet_loader import load_scholarships
-from web import build_html
+from config import DEPLOY_HOOK_URL, REVALIDATE_SECRET
+from export import EXPORTS, send_export
+from fetch import fetch_metrics
+from sheet_loader import get_dataset
+from web import build_html, search_json, stats_json
 
 
 FAVICON_FILE = "favicon.png"
 
 
+def _deployed_version(host: str) -> str | None:
+    """Version of the static build currently served (version.json written by build_static.py);
+    None when it cannot be read (Deployment Protection, wrong host, transient failure)."""
+    try:
+        with urllib.request.urlopen(f"https://{host}/version.json", timeout=5) as r:
+            return json.loads(r.read()).get("version")
+    except (OSError, ValueError):
+        return None
+
+
 class handler(BaseHTTPRequestHandler):
+    def _revalidate(self, params: dict) -> tuple[int, dict]:
+        """Rebuild the static output via the deploy hook if the sheet changed since the last build.
+        Called by the Vercel cron (Authorization: Bearer $CRON_SECRET) or on demand with ?secret=."""
+        given = (self.headers.get("Authorization") or "").removeprefix("Bearer ") or params.get("secret", [""])[0]
+        if not REVALIDATE_SECRET or not hmac.compare_digest(given.encode(), REVALIDATE_SECRET.encode()):
+            return 401, {"error": "unauthorized"}
+        dataset = get_dataset(use_local_fallback=False, max_age=0)
+        if not dataset.rows:
+            return 502, {"error": "sheet returned no rows; keeping current build"}
+        host = self.headers.get("X-Forwarded-Host") or self.headers.get("Host") or ""
+        deployed = _deployed_version(host)
+        if "force" not in params:
+            if deployed is None:
+                # Unknown is not "changed": redeploying on every cron run would never settle
+                return 502, {"error": f"could not read https://{host}/version.json; not redeploying", "version": dataset.version}
+            if deployed == dataset.version:
+                return 200, {"changed": False, "version": deployed}
+        if not DEPLOY_HOOK_URL:
+            return 503, {"error": "VERCEL_DEPLOY_HOOK_URL is not set", "version": dataset.version}
+        try:
+            urllib.request.urlopen(urllib.request.Request(DEPLOY_HOOK_URL, data=b"", method="POST"), timeout=10).close()
+        except OSError as e:
+            return 502, {"error": f"deploy hook failed: {e}"}
+        return 202, {"changed": True, "previous": deployed, "version": dataset.version}
+
     def do_GET(self):
-        path = self.path.split("?")[0]
+        url = urlsplit(self.path)
+        path = url.path
+        query = parse_qs(url.query).get("q", [""])[0]
         if path in ("/favicon.png", "/favicon.ico"):
             favicon = _root / FAVICON_FILE
             if favicon.exists():
@@ -28,8 +77,46 @@ class handler(BaseHTTPRequestHandler):
                 self.end_headers()
                 self.wfile.write(body)
                 return
-        scholarships = load_scholarships(use_local_fallback=False)
-        html = build_html(scholarships=scholarships)
+        if path == "/metrics.json":
+            body = json.dumps(fetch_metrics()).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if path == "/revalidate":
+            status, result = self._revalidate(parse_qs(url.query))
+            body = json.dumps(result).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Cache-Control", "no-store")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        # Module state survives between invocations on a warm instance, so reuse the dataset
+        dataset = get_dataset(use_local_fallback=False)
+        if path in EXPORTS:
+            send_export(self, path, dataset, parse_qs(url.query))
+            return
+        if path == "/stats.json":
+            body = stats_json(dataset=dataset).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if path == "/search":
+            body = search_json(query, dataset=dataset).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        html = build_html(query=query, dataset=dataset)
         body = html.encode("utf-8")
         self.send_response(200)
         self.send_header("Content-Type", "text/html; charset=utf-8")
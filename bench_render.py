@@ -0,0 +1,141 @@
+"""Benchmark: row rendering with interned columns + per-refresh memos vs per-cell escaping.
+
+Run:  python bench_render.py [rows]   (default 50000)
+
+Generates a synthetic sheet export, loads it through sheet_loader with and without
+interning, and times the table-row rendering of the original per-cell loop against
+web._rows_html (cold memo = first render after a refresh, warm = every render after).
+"""
+
+import csv
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import sheet_loader
+from sheet_loader import Dataset
+from web import _esc, _rows_html, _status_to_row_class
+
+STATUSES = ["Accepted", "Rejected", "Admissions Review", "Application Submitted", "In Progress", ""]
+COUNTRIES = ["Germany", "Canada", "Netherlands", "Sweden", "Japan", "Australia", "Finland", "Italy"]
+ENTRIES = ["Direct", "Common App", "Uni-assist", "Studyinfo", "Agent & Partner"]
+
+
+def _write_sheet(path: Path, n: int) -> None:
+    rnd = random.Random(42)
+    universities = [f"University of {c} {i}" for i, c in enumerate(COUNTRIES * 40)]
+    deadlines = [f"2027-0{m}-{d:02d}" for m in range(1, 10) for d in (1, 15, 28)]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["University", "Program", "Scholarship", "Deadline", "Application date",
+                    "Application Status", "Point of Entry", "Country", "Link"])
+        for i in range(n):
+            w.writerow([
+                rnd.choice(universities),
+                f"MSc Program {i % 900}",
+                f"Scholarship {i % 300}",
+                rnd.choice(deadlines),
+                rnd.choice(deadlines),
+                rnd.choice(STATUSES),
+                rnd.choice(ENTRIES),
+                rnd.choice(COUNTRIES),
+                f"https://example.edu/apply/{i}",
+            ])
+
+
+def _reference_rows_html(scholarships: list[dict]) -> str:
+    """Row loop as it was before memoization: every cell escaped, every status classified."""
+    rows = []
+    for idx, s in enumerate(scholarships):
+        uni = _esc(s.get("university"))
+        program = _esc(s.get("program"))
+        scholarship = _esc(s.get("scholarship"))
+        deadline = _esc(s.get("deadline"))
+        app_date = _esc(s.get("application_date"))
+        status = _esc(s.get("application_status"))
+        entry = _esc(s.get("point_of_entry"))
+        country = _esc(s.get("country"))
+        link = (s.get("link") or "").strip()
+        link_cell = f'<a href="{_esc(link)}" target="_blank" rel="noopener">Link</a>' if link else "—"
+        status_class = _status_to_row_class(s.get("application_status") or "")
+        row_class = f' class="{status_class}"' if status_class else ""
+        data_attr = f' data-idx="{idx}" data-status="{_esc(status)}" data-country="{_esc(country)}" data-entry="{_esc(entry)}"'
+        rows.append(
+            f'<tr{row_class}{data_attr}>'
+            f'<td data-label="University">{uni}</td><td data-label="Program">{program}</td><td data-label="Scholarship">{scholarship}</td>'
+            f'<td data-label="Deadline">{deadline}</td><td data-label="Application date">{app_date}</td><td data-label="Status">{status}</td>'
+            f'<td data-label="Point of Entry">{entry}</td><td data-label="Country">{country}</td><td data-label="Link">{link_cell}</td></tr>'
+        )
+    return "\n".join(rows)
+
+
+def _load(path: Path, intern: bool) -> tuple[list[dict], int]:
+    """Load rows; return them with the bytes they keep alive (tracemalloc)."""
+    saved = sheet_loader.INTERNED_COLUMNS
+    if not intern:
+        sheet_loader.INTERNED_COLUMNS = ()
+    try:
+        tracemalloc.start()
+        rows = sheet_loader.load_from_local(path)
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        sheet_loader.INTERNED_COLUMNS = saved
+    return rows, retained
+
+
+def _time_render(fn, repeat: int = 5) -> tuple[float, int]:
+    """Best-of-N CPU seconds, plus peak bytes allocated during one render."""
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.process_time()
+        fn()
+        best = min(best, time.process_time() - t)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def _fresh(rows: list[dict]) -> Dataset:
+    """Dataset wrapper with an empty memo, without rebuilding index/stats for each timing run."""
+    ds = object.__new__(Dataset)
+    ds.rows = rows
+    ds.memo = {}
+    return ds
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "sheet.csv"
+        _write_sheet(path, n)
+        plain_rows, plain_mem = _load(path, intern=False)
+        rows, interned_mem = _load(path, intern=True)
+
+    print(f"{n} rows")
+    print(f"  loaded rows, not interned: {plain_mem / 1e6:8.1f} MB")
+    print(f"  loaded rows, interned:     {interned_mem / 1e6:8.1f} MB")
+
+    ref_cpu, ref_peak = _time_render(lambda: _reference_rows_html(plain_rows))
+
+    def cold():
+        _rows_html(_fresh(rows))
+
+    dataset = _fresh(rows)
+    _rows_html(dataset)
+    assert _rows_html(dataset) == _reference_rows_html(rows), "memoized render differs from reference"
+    cold_cpu, cold_peak = _time_render(cold)
+    warm_cpu, warm_peak = _time_render(lambda: _rows_html(dataset))
+
+    print(f"  render, per-cell escaping: {ref_cpu * 1e3:8.1f} ms CPU  peak {ref_peak / 1e6:6.1f} MB")
+    print(f"  render, memo cold:         {cold_cpu * 1e3:8.1f} ms CPU  peak {cold_peak / 1e6:6.1f} MB")
+    print(f"  render, memo warm:         {warm_cpu * 1e3:8.1f} ms CPU  peak {warm_peak / 1e6:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Pre-render the tracker as static files (Vercel build command; also usable for any static host).
+
+    python build_static.py [--out public] [--allow-empty]
+
+Writes index.html (+ .gz, and .br when the optional `brotli` package is installed),
+data.json (normalized rows), stats.json, version.json and the favicon. On Vercel these are
+served from the CDN (the page applies ?q= itself); the Python function only handles /search,
+the exports, /metrics.json and /revalidate (which triggers a rebuild through the deploy hook
+when the sheet changed).
+"""
+
+import argparse
+import gzip
+import json
+import shutil
+import sys
+import time
+from pathlib import Path
+
+from config import STATIC_OUTPUT_DIR
+from sheet_loader import Dataset, load_scholarships
+from web import page_bytes
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+_ROOT = Path(__file__).resolve().parent
+FAVICON_FILE = "favicon.png"
+
+
+def _write(path: Path, body: bytes, compress: bool = False) -> list[Path]:
+    path.write_bytes(body)
+    written = [path]
+    if compress:
+        gz = path.with_name(path.name + ".gz")
+        gz.write_bytes(gzip.compress(body, compresslevel=9, mtime=0))
+        written.append(gz)
+        if brotli is not None:
+            br = path.with_name(path.name + ".br")
+            br.write_bytes(brotli.compress(body, quality=11))
+            written.append(br)
+    return written
+
+
+def build(out_dir: Path, dataset: Dataset) -> list[Path]:
+    """Render dataset into out_dir; returns the files written."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    version = {"version": dataset.version, "row_count": len(dataset.rows), "built_at": int(time.time())}
+    written = []
+    written += _write(out_dir / "index.html", page_bytes(dataset), compress=True)
+    written += _write(
+        out_dir / "data.json",
+        json.dumps({**version, "rows": dataset.rows}, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        compress=True,
+    )
+    written += _write(out_dir / "stats.json", dataset.stats.to_json().encode("utf-8"), compress=True)
+    written += _write(out_dir / "version.json", json.dumps(version).encode("utf-8"))
+    favicon = _ROOT / FAVICON_FILE
+    if favicon.exists():
+        shutil.copyfile(favicon, out_dir / FAVICON_FILE)
+        written.append(out_dir / FAVICON_FILE)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--out", default=str(_ROOT / STATIC_OUTPUT_DIR))
+    parser.add_argument("--allow-empty", action="store_true", help="write the page even if no rows were loaded")
+    args = parser.parse_args()
+
+    rows = load_scholarships(use_local_fallback=True)
+    if not rows and not args.allow_empty:
+        # Failing the build keeps the previous deployment live instead of publishing an empty table
+        print("No rows loaded from the sheet or local export; not writing static output.", file=sys.stderr)
+        sys.exit(1)
+    dataset = Dataset(rows)
+    for path in build(Path(args.out), dataset):
+        print(f"  {path.relative_to(Path(args.out).parent)}  {path.stat().st_size:,} bytes")
+    print(f"Built {len(rows)} rows, version {dataset.version}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,13 @@
 """Configuration for Scholarship Application Tracker."""
 
+import os
+
 SPREADSHEET_ID = "1Dzf0VZoaE9u-1Wr4JRtR6VU-p3ZNZ4XbC9AnGXCq9Ss"
-# Use export without gid so public sheets return CSV (gid=0 can cause 400)
-SHEET_CSV_URL = (
-    f"https://docs.google.com/spreadsheets/d/{SPREADSHEET_ID}/export?format=csv"
+# Use export without gid so public sheets return CSV (gid=0 can cause 400).
+# Override with the SHEET_CSV_URL env var, e.g. to point at fake_sheet.py for load tests.
+SHEET_CSV_URL = os.environ.get(
+    "SHEET_CSV_URL",
+    f"https://docs.google.com/spreadsheets/d/{SPREADSHEET_ID}/export?format=csv",
 )
 
 COLUMNS = [
@@ -19,3 +23,25 @@ COLUMNS = [
 ]
 
 LOCAL_CSV_PATH = "scholarships_export.csv"
+
+# Seconds a loaded dataset (rows + search index) is reused before refetching the sheet
+CACHE_TTL_SECONDS = 60
+
+# Sheet fetch: per-socket-operation timeout, attempts per fetch, backoff (jittered, exponential)
+FETCH_TIMEOUT_SECONDS = 10
+FETCH_MAX_ATTEMPTS = 3
+FETCH_BACKOFF_BASE_SECONDS = 0.5
+FETCH_BACKOFF_MAX_SECONDS = 8
+# Idle keep-alive connections kept per host
+FETCH_POOL_SIZE = 4
+# Circuit breaker: open after this many failed fetches in a row, probe again after reset seconds
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RESET_SECONDS = 30
+
+# Static build for Vercel (build_static.py): output directory, and the deploy hook that
+# /revalidate calls to rebuild it. Requests to /revalidate must carry CRON_SECRET.
+# vercel.json runs the cron daily, the most Hobby plans allow; on Pro it can be hourly
+# ("0 * * * *"), and /revalidate?secret=... rebuilds on demand either way.
+STATIC_OUTPUT_DIR = "public"
+DEPLOY_HOOK_URL = os.environ.get("VERCEL_DEPLOY_HOOK_URL", "")
+REVALIDATE_SECRET = os.environ.get("CRON_SECRET", "")
@@ -0,0 +1,231 @@
+"""Streaming bulk exports: /export.csv, /export.jsonl and /deadlines.ics.
+
+Rows come from the cached Dataset, are filtered lazily (same status / country / entry filters
+as the page, plus the ?q= search) and encoded in batches by generators, so no export is ever
+held in memory whole. Responses use chunked transfer for HTTP/1.1 clients and carry a weak
+ETag (dataset version + filters) so pollers such as calendar apps get a cheap 304.
+"""
+
+import csv
+import functools
+import hashlib
+import io
+import json
+import re
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+
+from config import COLUMNS
+from search import mask_to_ids
+from sheet_loader import HEADER_MAP, Dataset
+
+# Rows encoded per yielded chunk
+EXPORT_CHUNK_ROWS = 500
+
+# Query parameter -> column; same filters as the page's dropdowns
+FILTER_PARAMS = {"status": "application_status", "country": "country", "entry": "point_of_entry"}
+
+# Sheet header per column (first spelling in HEADER_MAP), so exported CSV loads back as-is
+CSV_HEADERS = [next(h for h, key in HEADER_MAP.items() if key == col) for col in COLUMNS]
+
+_DEADLINE_FORMATS = (
+    "%Y-%m-%d", "%Y/%m/%d", "%d/%m/%Y", "%m/%d/%Y", "%d.%m.%Y", "%d-%m-%Y",
+    "%d %B %Y", "%d %b %Y", "%B %d, %Y", "%b %d, %Y", "%B %d %Y", "%b %d %Y", "%d-%b-%Y",
+)
+_ORDINAL_RE = re.compile(r"(\d{1,2})(st|nd|rd|th)\b", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_deadline(value: str) -> date | None:
+    """Parse a sheet deadline ("2027-01-15", "15/01/2027", "January 15th, 2027", ...); None if not a date.
+    Day-first is tried before month-first for ambiguous slash dates."""
+    s = _ORDINAL_RE.sub(r"\1", (value or "").strip())
+    if not s:
+        return None
+    for fmt in _DEADLINE_FORMATS:
+        try:
+            return datetime.strptime(s, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def select_rows(dataset: Dataset, params: dict):
+    """Yield rows matching the filter params (status, country, entry, q); params as from parse_qs."""
+    wanted = [(col, params[p][0]) for p, col in FILTER_PARAMS.items() if params.get(p, [""])[0]]
+    matched = dataset.index.search(params.get("q", [""])[0])
+    ids = range(len(dataset.rows)) if matched is None else mask_to_ids(matched)
+    rows = dataset.rows
+    for i in ids:
+        row = rows[i]
+        if all((row.get(col) or "").strip() == value for col, value in wanted):
+            yield row
+
+
+def _batched(rows, n: int = EXPORT_CHUNK_ROWS):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= n:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_csv(rows):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(CSV_HEADERS)
+    for batch in _batched(rows):
+        writer.writerows([row.get(col) or "" for col in COLUMNS] for row in batch)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+def iter_jsonl(rows):
+    for batch in _batched(rows):
+        yield "".join(
+            json.dumps({col: row.get(col) or "" for col in COLUMNS}, ensure_ascii=False) + "\n" for row in batch
+        ).encode("utf-8")
+
+
+_NEWLINE_RE = re.compile(r"\r\n|\r|\n")
+
+
+def _ics_text(value: str) -> str:
+    value = value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+    return _NEWLINE_RE.sub(r"\\n", value)
+
+
+def _ics_line(line: str) -> str:
+    """Fold to 75-octet lines (RFC 5545 3.1) without splitting UTF-8 sequences."""
+    raw = line.encode("utf-8")
+    if len(raw) <= 75:
+        return line + "\r\n"
+    parts, start, limit = [], 0, 75
+    while start < len(raw):
+        end = min(start + limit, len(raw))
+        while end < len(raw) and (raw[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(raw[start:end].decode("utf-8"))
+        start, limit = end, 74  # continuation lines start with a space
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _ics_uid_source(row: dict) -> str:
+    return "\x1f".join(row.get(col) or "" for col in ("university", "program", "scholarship", "deadline"))
+
+
+def _ics_event(row: dict, deadline: date, stamp: str, occurrence: int = 0) -> str:
+    uni = row.get("university") or ""
+    program = row.get("program") or ""
+    # Duplicate rows would share a UID and calendar clients merge those; the first copy keeps
+    # the plain hash so its UID stays stable when duplicates come and go
+    uid_src = _ics_uid_source(row) + (f"\x1f{occurrence}" if occurrence else "")
+    uid = hashlib.blake2b(uid_src.encode("utf-8"), digest_size=12).hexdigest()
+    title = " – ".join(x for x in (uni, program) if x) or "Scholarship"
+    details = [f"{label}: {row.get(col)}" for label, col in (
+        ("Scholarship", "scholarship"), ("Status", "application_status"),
+        ("Point of Entry", "point_of_entry"), ("Country", "country"),
+    ) if row.get(col)]
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}@scholarship-tracker",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART;VALUE=DATE:{deadline:%Y%m%d}",
+        f"DTEND;VALUE=DATE:{deadline + timedelta(days=1):%Y%m%d}",
+        f"SUMMARY:{_ics_text('Deadline: ' + title)}",
+    ]
+    if details:
+        lines.append(f"DESCRIPTION:{_ics_text(chr(10).join(details))}")
+    if row.get("link"):
+        # URI value: no escaping applies, so drop line breaks rather than let a cell inject lines
+        lines.append(f"URL:{_NEWLINE_RE.sub('', row['link'].strip())}")
+    lines.append("END:VEVENT")
+    return "".join(_ics_line(line) for line in lines)
+
+
+def iter_ics(rows, loaded_at: float | None = None):
+    """All-day VEVENT per row whose deadline parses; rows without a date are skipped."""
+    stamp = datetime.fromtimestamp(loaded_at or time.time(), timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    yield (
+        "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Scholarship Application Tracker//EN\r\n"
+        "CALSCALE:GREGORIAN\r\nMETHOD:PUBLISH\r\nX-WR-CALNAME:Scholarship deadlines\r\n"
+    ).encode("utf-8")
+    seen = Counter()
+    for batch in _batched(rows):
+        events = []
+        for row in batch:
+            deadline = parse_deadline(row.get("deadline") or "")
+            if deadline is not None:
+                key = _ics_uid_source(row)
+                events.append(_ics_event(row, deadline, stamp, seen[key]))
+                seen[key] += 1
+        if events:
+            yield "".join(events).encode("utf-8")
+    yield b"END:VCALENDAR\r\n"
+
+
+# path -> (content type, download filename)
+EXPORTS = {
+    "/export.csv": ("text/csv; charset=utf-8", "scholarships.csv"),
+    "/export.jsonl": ("application/x-ndjson; charset=utf-8", "scholarships.jsonl"),
+    "/deadlines.ics": ("text/calendar; charset=utf-8", "deadlines.ics"),
+}
+
+
+def _chunks(path: str, dataset: Dataset, params: dict):
+    rows = select_rows(dataset, params)
+    if path == "/export.csv":
+        return iter_csv(rows)
+    if path == "/export.jsonl":
+        return iter_jsonl(rows)
+    return iter_ics(rows, dataset.loaded_at)
+
+
+def etag(dataset: Dataset, params: dict) -> str:
+    keys = ("q", *FILTER_PARAMS)
+    filters = "\x1f".join(params.get(k, [""])[0] for k in keys)
+    return f'W/"{dataset.version}-{hashlib.blake2b(filters.encode("utf-8"), digest_size=6).hexdigest()}"'
+
+
+def send_export(handler, path: str, dataset: Dataset, params: dict) -> None:
+    """Stream the export at path through a BaseHTTPRequestHandler (chunked for HTTP/1.1)."""
+    content_type, filename = EXPORTS[path]
+    tag = etag(dataset, params)
+    chunked = handler.request_version == "HTTP/1.1"
+    if chunked:
+        # Chunked encoding needs an HTTP/1.1 status line; the connection still closes afterwards
+        handler.protocol_version = "HTTP/1.1"
+    if handler.headers.get("If-None-Match") == tag:
+        handler.send_response(304)
+        handler.send_header("ETag", tag)
+        handler.send_header("Content-Length", "0")
+        handler.send_header("Connection", "close")
+        handler.end_headers()
+        return
+    handler.send_response(200)
+    handler.send_header("Content-Type", content_type)
+    handler.send_header("Content-Disposition", f'inline; filename="{filename}"')
+    handler.send_header("ETag", tag)
+    handler.send_header("Cache-Control", "no-cache")
+    if chunked:
+        handler.send_header("Transfer-Encoding", "chunked")
+    handler.send_header("Connection", "close")
+    handler.end_headers()
+    try:
+        for chunk in _chunks(path, dataset, params):
+            if chunked:
+                handler.wfile.write(b"%X\r\n%s\r\n" % (len(chunk), chunk))
+            else:
+                handler.wfile.write(chunk)
+        if chunked:
+            handler.wfile.write(b"0\r\n\r\n")
+    except (BrokenPipeError, ConnectionResetError):
+        # Client went away mid-download; nothing left to do
+        pass
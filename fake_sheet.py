@@ -0,0 +1,180 @@
+"""Local stand-in for the Google Sheets CSV export, for load and fault testing.
+
+    python fake_sheet.py --port 8900 --rows 5000 --latency-ms 150
+    SHEET_CSV_URL=http://127.0.0.1:8900/export python serve.py
+
+GET /export serves a generated sheet with an ETag (If-None-Match -> 304) and gzip when asked.
+Query parameters override the CLI defaults per request, so the URL in SHEET_CSV_URL can carry
+the scenario:  rows, latency_ms, jitter_ms, error_rate, status (error status code), mode
+(csv | html | error | reset | hang).  GET /_stats returns request counters; POST /_stats resets.
+"""
+
+import argparse
+import csv
+import functools
+import gzip
+import hashlib
+import http.server
+import io
+import json
+import random
+import threading
+import time
+from collections import Counter
+from urllib.parse import parse_qs, urlsplit
+
+HEADERS = ["University", "Program", "Scholarship", "Deadline", "Application date",
+           "Application Status", "Point of Entry", "Country", "Link"]
+STATUSES = ["Accepted", "Rejected", "Admissions Review", "Application Submitted", "In Progress", ""]
+COUNTRIES = ["Germany", "Canada", "Netherlands", "Sweden", "Japan", "Australia", "Finland", "Italy"]
+ENTRIES = ["Direct", "Common App", "Uni-assist", "Studyinfo", "Agent & Partner"]
+LOGIN_PAGE = b"<!DOCTYPE html><html><head><title>Sign in - Google Accounts</title></head><body>Sign in</body></html>"
+
+
+@functools.lru_cache(maxsize=8)
+def sheet_csv(rows: int) -> tuple[bytes, str]:
+    """Deterministic CSV body with `rows` data rows, and its ETag."""
+    rnd = random.Random(rows)
+    universities = [f"University of {c} {i}" for i, c in enumerate(COUNTRIES * 40)]
+    out = io.StringIO()
+    w = csv.writer(out)
+    w.writerow(HEADERS)
+    for i in range(rows):
+        month, day = rnd.randint(1, 12), rnd.randint(1, 28)
+        w.writerow([
+            rnd.choice(universities),
+            f"MSc Program {i % 900}",
+            f"Scholarship {i % 300}",
+            f"2027-{month:02d}-{day:02d}",
+            f"2026-{month:02d}-{day:02d}",
+            rnd.choice(STATUSES),
+            rnd.choice(ENTRIES),
+            rnd.choice(COUNTRIES),
+            f"https://example.edu/apply/{i}",
+        ])
+    body = out.getvalue().encode("utf-8")
+    return body, '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+class _Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = Counter()
+
+    def add(self, key: str) -> None:
+        with self.lock:
+            self.counts[key] += 1
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return dict(self.counts)
+
+    def reset(self) -> None:
+        with self.lock:
+            self.counts.clear()
+
+
+def make_handler(defaults: dict, stats: _Stats):
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status: int, body: bytes = b"", content_type: str = "text/plain", headers: dict | None = None):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            if urlsplit(self.path).path == "/_stats":
+                stats.reset()
+                self._send(204)
+                return
+            self._send(404)
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            if url.path == "/_stats":
+                self._send(200, json.dumps(stats.snapshot()).encode("utf-8"), "application/json")
+                return
+            if url.path != "/export":
+                self._send(404)
+                return
+            opts = dict(defaults)
+            for k, v in parse_qs(url.query).items():
+                if k in opts:
+                    opts[k] = type(opts[k])(v[0])
+            stats.add("requests")
+
+            delay = opts["latency_ms"] + random.uniform(0, opts["jitter_ms"])
+            if delay:
+                time.sleep(delay / 1000)
+            mode = opts["mode"]
+            if mode == "csv" and opts["error_rate"] and random.random() < opts["error_rate"]:
+                mode = "error"
+            stats.add(f"mode_{mode}")
+
+            if mode == "reset":
+                self.close_connection = True
+                self.connection.close()
+                return
+            if mode == "hang":
+                time.sleep(3600)
+                return
+            if mode == "html":
+                self._send(200, LOGIN_PAGE, "text/html; charset=utf-8")
+                return
+            if mode == "error":
+                self._send(opts["status"], b"upstream error", headers={"Retry-After": "1"} if opts["status"] == 429 else None)
+                return
+
+            body, etag = sheet_csv(opts["rows"])
+            if self.headers.get("If-None-Match") == etag:
+                stats.add("not_modified")
+                self._send(304, headers={"ETag": etag})
+                return
+            headers = {"ETag": etag, "Cache-Control": "no-cache"}
+            if "gzip" in (self.headers.get("Accept-Encoding") or ""):
+                body = gzip.compress(body, compresslevel=5)
+                headers["Content-Encoding"] = "gzip"
+            stats.add("csv_served")
+            self._send(200, body, "text/csv; charset=utf-8", headers)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of csv requests answered with --status")
+    parser.add_argument("--status", type=int, default=503)
+    parser.add_argument("--mode", default="csv", choices=["csv", "html", "error", "reset", "hang"])
+    args = parser.parse_args()
+    defaults = {
+        "rows": args.rows,
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "error_rate": args.error_rate,
+        "status": args.status,
+        "mode": args.mode,
+    }
+    httpd = http.server.ThreadingHTTPServer((args.host, args.port), make_handler(defaults, _Stats()))
+    httpd.daemon_threads = True
+    print(f"Fake sheet: http://{args.host}:{args.port}/export  ({args.rows} rows, mode={args.mode})", flush=True)
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()
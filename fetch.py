@@ -0,0 +1,323 @@
+"""HTTP fetch layer for the sheet export: keep-alive connection pool, retries with jittered
+exponential backoff, a circuit breaker, and counters for each failure mode."""
+
+import gzip
+import http.client
+import random
+import socket
+import threading
+import time
+import zlib
+from collections import Counter
+from urllib.parse import urljoin, urlsplit
+
+from config import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_SECONDS,
+    FETCH_BACKOFF_BASE_SECONDS,
+    FETCH_BACKOFF_MAX_SECONDS,
+    FETCH_MAX_ATTEMPTS,
+    FETCH_POOL_SIZE,
+    FETCH_TIMEOUT_SECONDS,
+)
+
+USER_AGENT = "Mozilla/5.0 (compatible; ScholarshipTracker/1.0)"
+MAX_REDIRECTS = 5
+_REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class FetchError(Exception):
+    """Fetching the sheet failed; `kind` is the metrics key for the failure mode."""
+
+    kind = "error"
+    retryable = False
+
+
+class FetchTimeout(FetchError):
+    kind = "timeout"
+    retryable = True
+
+
+class FetchConnectionError(FetchError):
+    kind = "connection_error"
+    retryable = True
+
+
+class HTTPStatusError(FetchError):
+    def __init__(self, status: int, retry_after: float | None = None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+        self.retryable = status in _RETRY_STATUSES
+        self.kind = "http_5xx" if status >= 500 else "http_429" if status == 429 else "http_4xx"
+
+
+class TooManyRedirects(FetchError):
+    kind = "redirect_loop"
+
+
+class HTMLResponseError(FetchError):
+    """Upstream answered with an HTML page (usually a login page: sheet not shared publicly)."""
+
+    kind = "html_response"
+
+
+class CorruptBodyError(FetchError):
+    """Body could not be decoded (e.g. truncated or invalid gzip)."""
+
+    kind = "corrupt_body"
+    retryable = True
+
+
+class UnparseableCSVError(FetchError):
+    """Body arrived but is not CSV the loader can parse (raised by sheet_loader)."""
+
+    kind = "unparseable_csv"
+
+
+class CircuitOpenError(FetchError):
+    kind = "circuit_open"
+
+
+class CircuitBreaker:
+    """closed -> open after `failure_threshold` consecutive failures; after `reset_timeout`
+    seconds one probe is let through (half-open) and its outcome closes or re-opens it."""
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_SECONDS,
+        clock=time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._probing = False
+
+
+class ConnectionPool:
+    """Idle keep-alive connections per (scheme, host, port); reused across fetches."""
+
+    def __init__(self, max_idle_per_host: int = FETCH_POOL_SIZE, timeout: float = FETCH_TIMEOUT_SECONDS):
+        self.max_idle_per_host = max_idle_per_host
+        self.timeout = timeout
+        self._idle: dict[tuple, list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, scheme: str, host: str, port: int | None) -> tuple[http.client.HTTPConnection, bool]:
+        """Return (connection, reused)."""
+        key = (scheme, host, port)
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(host, port, timeout=self.timeout), False
+
+    def release(self, scheme: str, host: str, port: int | None, conn: http.client.HTTPConnection) -> None:
+        key = (scheme, host, port)
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            conns = [c for idle in self._idle.values() for c in idle]
+            self._idle.clear()
+        for conn in conns:
+            conn.close()
+
+
+def _looks_like_html(text: str) -> bool:
+    stripped = text.lstrip()[:200].lower()
+    return stripped.startswith("<!") or "<html" in stripped
+
+
+class SheetFetcher:
+    """GET a URL as text through a ConnectionPool, retrying transient failures behind a CircuitBreaker."""
+
+    def __init__(
+        self,
+        pool: ConnectionPool | None = None,
+        breaker: CircuitBreaker | None = None,
+        max_attempts: int = FETCH_MAX_ATTEMPTS,
+        backoff_base: float = FETCH_BACKOFF_BASE_SECONDS,
+        backoff_max: float = FETCH_BACKOFF_MAX_SECONDS,
+        sleep=time.sleep,
+    ):
+        self.pool = pool or ConnectionPool()
+        self.breaker = breaker or CircuitBreaker()
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sleep = sleep
+        self._metrics = Counter()
+        self._metrics_lock = threading.Lock()
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._metrics_lock:
+            self._metrics[key] += n
+
+    def metrics(self) -> dict:
+        with self._metrics_lock:
+            out = dict(self._metrics)
+        out["breaker_state"] = self.breaker.state
+        return out
+
+    def _backoff(self, attempt: int, retry_after: float | None) -> float:
+        """Full jitter: uniform(0, min(max, base * 2**attempt)); Retry-After wins when given."""
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _request(self, url: str) -> tuple[int, http.client.HTTPMessage, bytes]:
+        parts = urlsplit(url)
+        scheme = parts.scheme or "https"
+        host, port = parts.hostname or "", parts.port
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip", "Connection": "keep-alive"}
+        conn, reused = self.pool.acquire(scheme, host, port)
+        try:
+            try:
+                conn.request("GET", target, headers=headers)
+                resp = conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                if not reused:
+                    raise
+                # Server dropped an idle keep-alive connection; that is not an upstream failure
+                conn.close()
+                self._count("stale_connection")
+                conn, reused = self.pool.acquire(scheme, host, port)
+                conn.request("GET", target, headers=headers)
+                resp = conn.getresponse()
+            body = resp.read()
+        except BaseException:
+            conn.close()
+            raise
+        self._count("connection_reused" if reused else "connection_opened")
+        if resp.will_close:
+            conn.close()
+        else:
+            self.pool.release(scheme, host, port, conn)
+        if resp.getheader("Content-Encoding", "").lower() == "gzip":
+            try:
+                body = gzip.decompress(body)
+            except (OSError, EOFError, zlib.error) as e:
+                raise CorruptBodyError(f"bad gzip body: {e}") from e
+        return resp.status, resp.headers, body
+
+    def _get_once(self, url: str) -> str:
+        for _ in range(MAX_REDIRECTS + 1):
+            try:
+                status, headers, body = self._request(url)
+            except (socket.timeout, TimeoutError) as e:
+                raise FetchTimeout(str(e) or "timed out") from e
+            except (OSError, http.client.HTTPException) as e:
+                raise FetchConnectionError(str(e) or type(e).__name__) from e
+            if status in _REDIRECT_STATUSES and headers.get("Location"):
+                url = urljoin(url, headers["Location"])
+                continue
+            if status >= 400:
+                retry_after = headers.get("Retry-After")
+                raise HTTPStatusError(status, float(retry_after) if (retry_after or "").isdigit() else None)
+            text = body.decode("utf-8", errors="replace")
+            if _looks_like_html(text):
+                raise HTMLResponseError("HTML response instead of CSV")
+            return text
+        raise TooManyRedirects(url)
+
+    def fetch_text(self, url: str) -> str:
+        """Body of url as text. Raises a FetchError subclass; CircuitOpenError without touching the network."""
+        if not self.breaker.allow():
+            self._count("circuit_open")
+            raise CircuitOpenError("upstream marked unhealthy; skipping fetch")
+        # Every outcome must reach the breaker, or a failed half-open probe leaves it stuck
+        try:
+            text = self._fetch_with_retries(url)
+        except BaseException as e:
+            if not isinstance(e, FetchError):
+                self._count("unexpected_error")
+            self._count("fetch_failed")
+            self.breaker.record_failure()
+            raise
+        self._count("fetch_ok")
+        self.breaker.record_success()
+        return text
+
+    def _fetch_with_retries(self, url: str) -> str:
+        for attempt in range(self.max_attempts):
+            try:
+                return self._get_once(url)
+            except FetchError as e:
+                self._count(e.kind)
+                if not e.retryable or attempt + 1 >= self.max_attempts:
+                    raise
+                self._count("retries")
+                self._sleep(self._backoff(attempt, getattr(e, "retry_after", None)))
+        raise AssertionError("unreachable")
+
+    def count(self, kind: str) -> None:
+        """Record a failure detected by the caller after a successful fetch (e.g. unparseable CSV)."""
+        self._count(kind)
+
+
+_fetcher = SheetFetcher()
+
+
+def fetch_text(url: str) -> str:
+    return _fetcher.fetch_text(url)
+
+
+def count_failure(kind: str) -> None:
+    _fetcher.count(kind)
+
+
+def fetch_metrics() -> dict:
+    """Counters per failure mode (timeout, connection_error, http_4xx/5xx/429, html_response,
+    corrupt_body, unparseable_csv, redirect_loop, circuit_open, unexpected_error), retries,
+    connection reuse, plus the breaker state."""
+    return _fetcher.metrics()
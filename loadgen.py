@@ -0,0 +1,189 @@
+"""Load generator: drive serve.py or the api/index.py handler against fake_sheet.py and report numbers.
+
+    python loadgen.py --target serve --requests 2000 --concurrency 32 --rows 5000
+    python loadgen.py --target api --path "/?q=data" --sheet-query "latency_ms=200&error_rate=0.1"
+    python loadgen.py --url http://127.0.0.1:8000/ --requests 500   (already running server, no spawning)
+
+With --target serve|api, a fake sheet and the target are started as subprocesses with
+SHEET_CSV_URL pointing at the fake. Reports throughput, latency percentiles, status codes
+and how many times the target fetched the upstream sheet during the run.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import Counter
+from pathlib import Path
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parent
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_port(port: int, timeout: float = 15.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"nothing listening on port {port} after {timeout}s")
+
+
+def _api_server(port: int) -> None:
+    """Host the Vercel handler class on a threading HTTP server (stand-in for the Vercel runtime)."""
+    import http.server
+
+    sys.path.insert(0, str(ROOT))
+    from api.index import handler
+
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", port), handler)
+    httpd.daemon_threads = True
+    httpd.serve_forever()
+
+
+async def _one_request(host: str, port: int, target: str, timeout: float) -> tuple[int, int]:
+    """GET target over a fresh connection; return (status, body bytes)."""
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    try:
+        writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}:{port}\r\nConnection: close\r\n\r\n".encode("ascii"))
+        await writer.drain()
+        data = await asyncio.wait_for(reader.read(), timeout)
+    finally:
+        writer.close()
+    head, _, body = data.partition(b"\r\n\r\n")
+    status_line = head.split(b"\r\n", 1)[0].split()
+    return (int(status_line[1]) if len(status_line) > 1 else 0), len(body)
+
+
+async def run_load(url: str, requests: int, concurrency: int, timeout: float) -> dict:
+    parts = urlsplit(url)
+    host, port = parts.hostname or "127.0.0.1", parts.port or 80
+    target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    latencies: list[float] = []
+    statuses = Counter()
+    sent = 0
+    body_bytes = 0
+
+    async def worker():
+        nonlocal sent, body_bytes
+        while sent < requests:
+            sent += 1
+            t = time.perf_counter()
+            try:
+                status, n = await _one_request(host, port, target, timeout)
+                body_bytes += n
+            except (OSError, asyncio.TimeoutError) as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - t)
+            statuses[status] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+
+    def pct(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000 if latencies else 0.0
+
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(pct(50), 2),
+            "p90": round(pct(90), 2),
+            "p99": round(pct(99), 2),
+            "max": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        },
+        "statuses": {str(k): v for k, v in statuses.items()},
+        "body_mb": round(body_bytes / 1e6, 2),
+    }
+
+
+def _sheet_stats(port: int) -> dict:
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stats", timeout=5) as r:
+        return json.loads(r.read() or b"{}")
+
+
+def main():
+    if len(sys.argv) == 3 and sys.argv[1] == "--api-server":
+        _api_server(int(sys.argv[2]))
+        return
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--target", choices=["serve", "api"], default="serve")
+    parser.add_argument("--url", help="load an already running server instead of spawning one")
+    parser.add_argument("--path", default="/", help="request path (with query) on the target")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--rows", type=int, default=1000, help="fake sheet size")
+    parser.add_argument("--sheet-query", default="", help="extra fake sheet query, e.g. latency_ms=200&error_rate=0.2")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    procs: list[subprocess.Popen] = []
+    sheet_port = None
+    try:
+        if args.url:
+            url = args.url
+        else:
+            sheet_port, port = _free_port(), _free_port()
+            procs.append(subprocess.Popen(
+                [sys.executable, str(ROOT / "fake_sheet.py"), "--port", str(sheet_port), "--rows", str(args.rows)],
+                stdout=subprocess.DEVNULL,
+            ))
+            _wait_for_port(sheet_port)
+            env = os.environ.copy()
+            env["SHEET_CSV_URL"] = f"http://127.0.0.1:{sheet_port}/export" + (f"?{args.sheet_query}" if args.sheet_query else "")
+            env["PORT"] = str(port)
+            cmd = [sys.executable, str(ROOT / "serve.py")] if args.target == "serve" else [sys.executable, str(ROOT / "loadgen.py"), "--api-server", str(port)]
+            procs.append(subprocess.Popen(cmd, cwd=str(ROOT), env=env, stdout=subprocess.DEVNULL))
+            _wait_for_port(port)
+            # No reset here: the fake sheet is fresh for this run, and the target may still be
+            # doing its first fetch (a prefork parent binds before fetching), so count from start
+            url = f"http://127.0.0.1:{port}{args.path}"
+
+        report = asyncio.run(run_load(url, args.requests, args.concurrency, args.timeout))
+        report["url"] = url
+        if sheet_port is not None:
+            stats = _sheet_stats(sheet_port)
+            report["upstream_fetches"] = stats.get("requests", 0)
+            report["upstream"] = stats
+    finally:
+        for p in procs:
+            p.terminate()
+        for p in procs:
+            try:
+                p.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                p.kill()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    lat = report["latency_ms"]
+    print(f"{report['url']}")
+    print(f"  {report['requests']} requests, concurrency {report['concurrency']}, {report['elapsed_s']} s")
+    print(f"  throughput: {report['throughput_rps']} req/s   body: {report['body_mb']} MB")
+    print(f"  latency ms: p50 {lat['p50']}  p90 {lat['p90']}  p99 {lat['p99']}  max {lat['max']}")
+    print(f"  statuses:   {report['statuses']}")
+    if "upstream_fetches" in report:
+        print(f"  upstream fetches: {report['upstream_fetches']}  {report['upstream']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""Prefork serving for serve.py: one fetcher process, N worker processes, one shared dataset.
+
+The parent binds the listening socket, refreshes the sheet (the only process that ever
+fetches) and publishes each new dataset as an mmap'd snapshot file: header, the rendered
+default page, then the pickled Dataset (rows, search index, aggregates, render memos).
+A generation counter in shared memory tells workers when to re-map. Workers are forked
+after the socket is bound, accept on it directly and never touch the upstream sheet, so
+upstream load stays at one fetch per CACHE_TTL_SECONDS however many workers run.
+"""
+
+import json
+import mmap
+import os
+import pickle
+import shutil
+import signal
+import struct
+import sys
+import tempfile
+import time
+import traceback
+from multiprocessing.sharedctypes import RawValue
+from pathlib import Path
+
+from config import CACHE_TTL_SECONDS
+from fetch import fetch_metrics
+from sheet_loader import Dataset, get_dataset
+from web import build_html
+
+# generation, length of the rendered page that follows the header
+_HEADER = struct.Struct("<QQ")
+SNAPSHOT_FILE = "snapshot.bin"
+METRICS_FILE = "metrics.json"
+# How often the parent checks for dead workers / a stale dataset
+SUPERVISE_INTERVAL_SECONDS = 1.0
+# A worker exiting sooner than this after spawn counts as a crash loop: respawns back off
+# exponentially up to the max, and the server gives up after this many such exits in a row
+WORKER_MIN_UPTIME_SECONDS = 5.0
+RESPAWN_BACKOFF_MAX_SECONDS = 60.0
+MAX_FAST_WORKER_EXITS = 8
+
+
+def _snapshot_dir() -> Path:
+    # tmpfs when available so the snapshot lives in RAM and is shared through the page cache
+    shm = Path("/dev/shm")
+    return Path(tempfile.mkdtemp(prefix="scholarship-tracker-", dir=shm if shm.is_dir() else None))
+
+
+def _write_atomic(path: Path, *chunks: bytes) -> None:
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp, path)
+
+
+class SnapshotWriter:
+    def __init__(self, directory: Path, generation):
+        self.path = directory / SNAPSHOT_FILE
+        self.metrics_path = directory / METRICS_FILE
+        self.generation = generation
+
+    def publish(self, dataset: Dataset) -> None:
+        page = build_html(dataset=dataset).encode("utf-8")
+        gen = self.generation.value + 1
+        payload = pickle.dumps(dataset, protocol=pickle.HIGHEST_PROTOCOL)
+        _write_atomic(self.path, _HEADER.pack(gen, len(page)), page, payload)
+        # Bump only after the file is in place, so a worker never sees a generation it cannot read
+        self.generation.value = gen
+
+    def publish_metrics(self) -> None:
+        _write_atomic(self.metrics_path, json.dumps(fetch_metrics()).encode("utf-8"))
+
+
+class SnapshotReader:
+    """Worker side: maps the latest snapshot when the shared generation moves on."""
+
+    def __init__(self, directory: Path, generation):
+        self.path = directory / SNAPSHOT_FILE
+        self.metrics_path = directory / METRICS_FILE
+        self.generation = generation
+        self._gen = 0
+        self._dataset: Dataset | None = None
+        self._page: memoryview | None = None
+
+    def _load(self) -> None:
+        with open(self.path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        gen, page_len = _HEADER.unpack_from(mm)
+        view = memoryview(mm)
+        start = _HEADER.size
+        # The page is served straight from the mapping; old mappings are unmapped once unreferenced
+        self._page = view[start:start + page_len]
+        self._dataset = pickle.loads(view[start + page_len:])
+        self._gen = gen
+
+    def current(self) -> tuple[Dataset, memoryview]:
+        """(dataset, rendered default page) for the newest published generation."""
+        if self._dataset is None or self.generation.value > self._gen:
+            self._load()
+        return self._dataset, self._page
+
+    def metrics(self) -> dict:
+        try:
+            return json.loads(self.metrics_path.read_bytes())
+        except (OSError, ValueError):
+            return {}
+
+
+def _spawn(serve_worker, reader: SnapshotReader) -> int:
+    pid = os.fork()
+    if pid:
+        return pid
+    # Child: Ctrl+C / SIGTERM reach the whole group; the parent handles shutdown
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    code = 0
+    try:
+        serve_worker(reader)
+    except BaseException:
+        code = 1
+        # os._exit skips interpreter cleanup, so report the crash here or it is lost
+        print(f"prefork: worker {os.getpid()} crashed:", file=sys.stderr)
+        traceback.print_exc()
+    finally:
+        sys.stderr.flush()
+        os._exit(code)
+
+
+def run(serve_worker, workers: int, use_local_fallback: bool = True) -> None:
+    """Publish the first snapshot, fork `workers` processes running serve_worker(reader), then
+    refresh/publish every CACHE_TTL_SECONDS and respawn workers that die (backing off, then
+    raising RuntimeError, if they keep dying right after start), until interrupted."""
+    directory = _snapshot_dir()
+    generation = RawValue("Q", 0)
+    writer = SnapshotWriter(directory, generation)
+    reader = SnapshotReader(directory, generation)
+    published = get_dataset(use_local_fallback=use_local_fallback)
+    writer.publish(published)
+    writer.publish_metrics()
+
+    # pid -> spawn time
+    pids = {_spawn(serve_worker, reader): time.monotonic() for _ in range(workers)}
+    missing = 0
+    fast_exits = 0
+    respawn_at = 0.0
+
+    def _stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _stop)
+    try:
+        while True:
+            time.sleep(SUPERVISE_INTERVAL_SECONDS)
+            while pids:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+                if not pid:
+                    break
+                now = time.monotonic()
+                uptime = now - pids.pop(pid)
+                missing += 1
+                if uptime < WORKER_MIN_UPTIME_SECONDS:
+                    fast_exits += 1
+                    if fast_exits >= MAX_FAST_WORKER_EXITS:
+                        raise RuntimeError(f"{fast_exits} workers in a row exited within "
+                                           f"{WORKER_MIN_UPTIME_SECONDS:g}s of starting; giving up")
+                    delay = min(RESPAWN_BACKOFF_MAX_SECONDS, SUPERVISE_INTERVAL_SECONDS * 2 ** (fast_exits - 1))
+                    respawn_at = max(respawn_at, now + delay)
+                else:
+                    fast_exits = 0
+                    delay = 0.0
+                print(f"prefork: worker {pid} exited with status {os.waitstatus_to_exitcode(status)} "
+                      f"after {uptime:.1f}s; respawning in {delay:.1f}s", file=sys.stderr)
+            if missing and time.monotonic() >= respawn_at:
+                for _ in range(missing):
+                    pids[_spawn(serve_worker, reader)] = time.monotonic()
+                missing = 0
+            dataset = get_dataset(use_local_fallback=use_local_fallback, max_age=CACHE_TTL_SECONDS)
+            if dataset is not published:
+                writer.publish(dataset)
+                published = dataset
+            writer.publish_metrics()
+    finally:
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in pids:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,131 @@
+"""In-memory full-text search over scholarship rows (prefix + simple typo tolerance)."""
+
+import bisect
+import re
+import unicodedata
+
+SEARCH_FIELDS = ("university", "program", "scholarship", "country")
+
+# Tokens shorter than this only match exactly / by prefix (typos on short words are mostly noise)
+MIN_TYPO_LEN = 4
+# Bounded memo of query -> matching row ids
+RESULT_CACHE_SIZE = 256
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase, strip accents and split into word tokens ("Zürich, ETH" -> ["zurich", "eth"])."""
+    if not text:
+        return []
+    folded = unicodedata.normalize("NFKD", text)
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    return _TOKEN_RE.findall(folded.lower())
+
+
+def _deletes(term: str) -> set[str]:
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def _ids_to_mask(ids: list[int]) -> int:
+    buf = bytearray((ids[-1] >> 3) + 1)
+    for i in ids:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+
+def mask_to_ids(mask: int) -> list[int]:
+    """Row ids whose bit is set in a search() result, ascending."""
+    bits = bin(mask)[:1:-1]
+    ids = []
+    i = bits.find("1")
+    while i != -1:
+        ids.append(i)
+        i = bits.find("1", i + 1)
+    return ids
+
+
+def mask_to_bytes(mask: int, size: int) -> bytes:
+    """A search() result as a little-endian bitmap over `size` rows: row i is bit i % 8 of byte i // 8."""
+    return mask.to_bytes((size + 7) // 8, "little")
+
+
+class SearchIndex:
+    """Inverted index: token -> bitset of row ids. Built once per dataset, never rescans row dicts.
+
+    search() ANDs query tokens; each token matches every indexed term it is a prefix of,
+    and tokens of MIN_TYPO_LEN+ chars also match terms within one edit (delete/insert/
+    substitute/transpose, via a precomputed deletion neighbourhood). Postings are Python
+    ints used as bitsets so unions/intersections over 100k rows stay well under a millisecond.
+    """
+
+    def __init__(self, rows: list[dict]):
+        postings: dict[str, list[int]] = {}
+        # Rows repeat the same university/country strings; tokenize each distinct value once
+        token_memo: dict[str, list[str]] = {}
+        for i, row in enumerate(rows):
+            for field in SEARCH_FIELDS:
+                value = row.get(field) or ""
+                tokens = token_memo.get(value)
+                if tokens is None:
+                    tokens = token_memo[value] = tokenize(value)
+                for tok in tokens:
+                    ids = postings.get(tok)
+                    if ids is None:
+                        postings[tok] = [i]
+                    elif ids[-1] != i:
+                        ids.append(i)
+        self.size = len(rows)
+        self._postings = {t: _ids_to_mask(ids) for t, ids in postings.items()}
+        self._terms = sorted(self._postings)
+        self._neighbours: dict[str, set[str]] = {}
+        for term in self._terms:
+            if len(term) >= MIN_TYPO_LEN:
+                for variant in _deletes(term) | {term}:
+                    self._neighbours.setdefault(variant, set()).add(term)
+        self._cache: dict[str, int] = {}
+
+    def _prefix_terms(self, token: str) -> list[str]:
+        lo = bisect.bisect_left(self._terms, token)
+        hi = bisect.bisect_left(self._terms, token + "\uffff", lo)
+        return self._terms[lo:hi]
+
+    def _typo_terms(self, token: str) -> set[str]:
+        if len(token) < MIN_TYPO_LEN:
+            return set()
+        found = set(self._neighbours.get(token, ()))
+        for variant in _deletes(token):
+            found.update(self._neighbours.get(variant, ()))
+        return found
+
+    def _match_token(self, token: str) -> int:
+        terms = set(self._prefix_terms(token))
+        terms.update(self._typo_terms(token))
+        mask = 0
+        for t in terms:
+            mask |= self._postings[t]
+        return mask
+
+    def search(self, query: str) -> int | None:
+        """Return a bitset of rows matching every query token (see mask_to_ids), or None for an empty query."""
+        tokens = sorted(set(tokenize(query)))
+        if not tokens:
+            return None
+        key = " ".join(tokens)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        result = -1
+        for t in tokens:
+            result &= self._match_token(t)
+            if not result:
+                break
+        if len(self._cache) >= RESULT_CACHE_SIZE:
+            # No lock (the index is pickled into prefork snapshots): threads evicting at once may
+            # pick the same oldest key, so tolerate it being gone already
+            try:
+                self._cache.pop(next(iter(self._cache)), None)
+            except (StopIteration, RuntimeError):
+                pass
+        self._cache[key] = result
+        return result
@@ -1,24 +1,61 @@
 """Run the Scholarship Application Tracker locally. Open http://localhost:8000
 
 For development with auto-restart on file changes, run:  python serve_dev.py
+To use several cores, set WORKERS=N: one process fetches the sheet, N forked workers
+serve from its published snapshot (see prefork.py; POSIX only).
 """
 
 import http.server
+import json
 import os
 import socketserver
 import webbrowser
 from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
 
-from web import build_html
+from export import EXPORTS, send_export
+from fetch import fetch_metrics
+from sheet_loader import get_dataset
+from web import build_html, page_bytes, search_json, stats_json
 
 PORT = int(os.environ.get("PORT", 8000))
+WORKERS = int(os.environ.get("WORKERS", 1))
 _ROOT = Path(__file__).resolve().parent
 FAVICON_FILE = "favicon.png"
+# Paths (besides the exports) answered from the dataset
+_DATASET_ROUTES = ("/", "/index.html", "/stats.json", "/search")
+
+
+# prefork.SnapshotReader in worker processes; None when this process loads the sheet itself
+_snapshot = None
+
+
+def _current():
+    """(dataset, rendered default page) from the prefork snapshot or the local cache."""
+    if _snapshot is not None:
+        return _snapshot.current()
+    dataset = get_dataset(use_local_fallback=True)
+    return dataset, page_bytes(dataset)
+
+
+class _Server(socketserver.TCPServer):
+    allow_reuse_address = True
+    # Default of 5 overflows under concurrent load (clients then wait for SYN retransmits)
+    request_queue_size = 128
+
+    def get_request(self):
+        conn, addr = super().get_request()
+        # Prefork workers accept on a non-blocking listener; on macOS/BSD the accepted socket
+        # inherits O_NONBLOCK, which would make handler reads fail with EAGAIN
+        conn.setblocking(True)
+        return conn, addr
 
 
 class _Handler(http.server.BaseHTTPRequestHandler):
     def do_GET(self):
-        path = self.path.split("?")[0]
+        url = urlsplit(self.path)
+        path = url.path
+        query = parse_qs(url.query).get("q", [""])[0]
         if path in ("/favicon.png", "/favicon.ico"):
             favicon = _ROOT / FAVICON_FILE
             if favicon.exists():
@@ -31,11 +68,40 @@ class _Handler(http.server.BaseHTTPRequestHandler):
                 return
             self.send_error(404)
             return
-        if path not in ("/", "/index.html"):
+        if path == "/metrics.json":
+            metrics = _snapshot.metrics() if _snapshot is not None else fetch_metrics()
+            body = json.dumps(metrics).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if path not in _DATASET_ROUTES and path not in EXPORTS:
+            # Checked before _current() so stray paths never trigger a sheet refresh
             self.send_error(404)
             return
-        html = build_html()
-        body = html.encode("utf-8")
+        dataset, page = _current()
+        if path in EXPORTS:
+            send_export(self, path, dataset, parse_qs(url.query))
+            return
+        if path == "/stats.json":
+            body = stats_json(dataset=dataset).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if path == "/search":
+            body = search_json(query, dataset=dataset).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        body = build_html(query=query, dataset=dataset).encode("utf-8") if query.strip() else page
         self.send_response(200)
         self.send_header("Content-Type", "text/html; charset=utf-8")
         self.send_header("Content-Length", str(len(body)))
@@ -48,13 +114,27 @@ class _Handler(http.server.BaseHTTPRequestHandler):
 
 def main():
     host = "0.0.0.0" if os.environ.get("PORT") else "127.0.0.1"
-    with socketserver.TCPServer((host, PORT), _Handler) as httpd:
+    with _Server((host, PORT), _Handler) as httpd:
         url = f"http://localhost:{PORT}"
         print(f"Open in browser: {url}")
         if host == "127.0.0.1":
             webbrowser.open(url)
         try:
-            httpd.serve_forever()
+            if WORKERS > 1 and hasattr(os, "fork"):
+                import prefork
+
+                def serve_worker(reader):
+                    global _snapshot
+                    _snapshot = reader
+                    # Every worker wakes on a new connection; losers of the accept() race get
+                    # BlockingIOError (ignored by socketserver) instead of blocking
+                    httpd.socket.setblocking(False)
+                    httpd.serve_forever()
+
+                print(f"Prefork: {WORKERS} workers sharing one fetcher")
+                prefork.run(serve_worker, WORKERS)
+            else:
+                httpd.serve_forever()
         except KeyboardInterrupt:
             print("\nStopped.")
 
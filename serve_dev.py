@@ -11,6 +11,11 @@ WATCH_FILES = [
     ROOT / "web.py",
     ROOT / "config.py",
     ROOT / "sheet_loader.py",
+    ROOT / "search.py",
+    ROOT / "stats.py",
+    ROOT / "fetch.py",
+    ROOT / "prefork.py",
+    ROOT / "export.py",
     ROOT / "serve.py",
     ROOT / "api" / "index.py",
 ]
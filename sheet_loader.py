@@ -1,11 +1,21 @@
 """Load scholarship applications from Google Sheets (CSV export) or local CSV."""
 
 import csv
+import hashlib
 import io
-import urllib.request
+import logging
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 
-from config import SHEET_CSV_URL, COLUMNS, LOCAL_CSV_PATH
+from config import SHEET_CSV_URL, COLUMNS, LOCAL_CSV_PATH, CACHE_TTL_SECONDS
+from fetch import FetchError, HTMLResponseError, UnparseableCSVError, count_failure, fetch_text
+from search import SearchIndex
+from stats import Aggregates
+
+logger = logging.getLogger(__name__)
 
 # Exact and normalized (lowercase) header -> our column key
 HEADER_MAP = {
@@ -25,6 +35,10 @@ HEADER_MAP_LOWER = {k.lower().strip(): v for k, v in HEADER_MAP.items()}
 # Fallback: column index -> key (sheet order A-I)
 COLUMN_INDEX_MAP = {i: col for i, col in enumerate(COLUMNS)}
 
+# Columns with a handful of distinct values: interned so rows share one string object
+# (less memory, and renderer memos keyed by these strings hit on identity)
+INTERNED_COLUMNS = ("university", "deadline", "application_date", "application_status", "point_of_entry", "country")
+
 
 def _header_to_key(h: str) -> str | None:
     h = h.strip()
@@ -35,18 +49,24 @@ def _header_to_key(h: str) -> str | None:
     return HEADER_MAP_LOWER.get(h.lower())
 
 
+def _intern_columns(row_dict: dict) -> dict:
+    for col in INTERNED_COLUMNS:
+        row_dict[col] = sys.intern(row_dict[col])
+    return row_dict
+
+
 def _normalize_row(raw_headers: list[str], row: list[str], use_index_fallback: bool = False) -> dict:
     out = {col: "" for col in COLUMNS}
     if use_index_fallback and len(raw_headers) >= len(COLUMNS):
         for i, col in enumerate(COLUMNS):
             if i < len(row):
                 out[col] = (row[i] or "").strip()
-        return out
+        return _intern_columns(out)
     for i, raw in enumerate(raw_headers):
         key = _header_to_key(raw)
         if key:
             out[key] = (row[i] if i < len(row) else "").strip()
-    return out
+    return _intern_columns(out)
 
 
 def _row_has_data(row_dict: dict) -> bool:
@@ -54,20 +74,19 @@ def _row_has_data(row_dict: dict) -> bool:
 
 
 def _fetch_csv(url: str) -> list[dict]:
-    req = urllib.request.Request(
-        url,
-        headers={"User-Agent": "Mozilla/5.0 (compatible; ScholarshipTracker/1.0)"},
-    )
-    with urllib.request.urlopen(req, timeout=20) as r:
-        text = r.read().decode("utf-8", errors="replace")
-    if not text or not text.strip():
+    try:
+        text = fetch_text(url)
+    except HTMLResponseError:
+        # Login page instead of CSV (sheet not public): nothing to parse
         return []
-    # If response looks like HTML (e.g. login page), don't parse as CSV
-    stripped = text.strip().lower()
-    if stripped.startswith("<!") or "<html" in stripped[:200]:
+    if not text or not text.strip():
         return []
-    reader = csv.reader(io.StringIO(text))
-    rows = list(reader)
+    try:
+        rows = list(csv.reader(io.StringIO(text)))
+    except csv.Error as e:
+        # e.g. a field over csv.field_size_limit(); treat like any other bad upstream response
+        count_failure(UnparseableCSVError.kind)
+        raise UnparseableCSVError(f"unparseable CSV: {e}") from e
     if not rows:
         return []
     raw_headers = [h.strip().lstrip("\ufeff") for h in rows[0]]
@@ -110,18 +129,80 @@ def load_from_local(path: str | Path | None = None) -> list[dict]:
     return result
 
 
+def _load_local_safely() -> list[dict]:
+    try:
+        return load_from_local()
+    except (OSError, csv.Error, UnicodeDecodeError) as e:
+        logger.warning("Could not read local export %s: %s", LOCAL_CSV_PATH, e)
+        return []
+
+
 def load_scholarships(use_local_fallback: bool = True) -> list[dict]:
     try:
         data = load_from_sheet()
         if data:
             return data
-    except Exception:
-        pass
+    except FetchError as e:
+        logger.warning("Sheet fetch failed (%s): %s", e.kind, e)
     if use_local_fallback:
-        try:
-            data = load_from_local()
-            if data:
-                return data
-        except Exception:
-            pass
+        return _load_local_safely()
     return []
+
+
+@dataclass
+class Dataset:
+    """Rows from one load plus the structures derived from them (built once per refresh)."""
+
+    rows: list[dict]
+    loaded_at: float = field(default_factory=time.time)
+    # Last time upstream was asked for fresh rows (a failed refresh keeps rows and bumps this)
+    checked_at: float = field(init=False)
+    index: SearchIndex = field(init=False)
+    stats: Aggregates = field(init=False)
+    # Content hash of the rows: equal for identical data, whichever process or build loaded it
+    version: str = field(init=False)
+    # Per-refresh render memos (escaped values, status classes, dashboard), dropped with the dataset
+    memo: dict = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self):
+        self.checked_at = self.loaded_at
+        self.index = SearchIndex(self.rows)
+        self.stats = Aggregates.from_rows(self.rows)
+        # Hashed here, at refresh time, rather than lazily on the first request that needs it
+        digest = hashlib.blake2b(digest_size=8)
+        for row in self.rows:
+            digest.update("\x1f".join(row.get(col) or "" for col in COLUMNS).encode("utf-8"))
+            digest.update(b"\x1e")
+        self.version = digest.hexdigest()
+
+
+_dataset: Dataset | None = None
+_dataset_lock = threading.Lock()
+
+
+def _refresh(current: Dataset | None, use_local_fallback: bool) -> Dataset:
+    try:
+        rows = load_from_sheet()
+    except FetchError as e:
+        logger.warning("Sheet fetch failed (%s): %s", e.kind, e)
+        rows = []
+    if rows:
+        return Dataset(rows)
+    # Upstream unhealthy or unshared: keep serving the last good rows, else the local export
+    if current is not None and current.rows:
+        current.checked_at = time.time()
+        return current
+    return Dataset(_load_local_safely() if use_local_fallback else [])
+
+
+def get_dataset(use_local_fallback: bool = True, max_age: float = CACHE_TTL_SECONDS) -> Dataset:
+    """Return the cached dataset, refreshing it when last checked more than max_age seconds ago."""
+    global _dataset
+    current = _dataset
+    if current is not None and time.time() - current.checked_at < max_age:
+        return current
+    with _dataset_lock:
+        current = _dataset
+        if current is None or time.time() - current.checked_at >= max_age:
+            current = _dataset = _refresh(current, use_local_fallback)
+    return current
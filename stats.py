@@ -0,0 +1,108 @@
+"""Summary statistics (status x country x point of entry) computed once per dataset refresh."""
+
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+
+# CSS class from status_to_row_class -> label shown on the dashboard / in JSON
+STATUS_BUCKETS = {
+    "status-accepted": "Accepted",
+    "rejected": "Rejected",
+    "status-admissions-review": "Admissions Review",
+    "status-applied": "Submitted",
+    "status-pending": "In Progress",
+    "": "Other",
+}
+
+
+def status_to_row_class(status: str) -> str:
+    """Map application status to a CSS class. Statuses: Accepted, Admissions Review, Application Submitted, Rejected, In Progress."""
+    s = (status or "").strip().lower()
+    if not s:
+        return ""
+    if "rejected" in s:
+        return "rejected"
+    if "accepted" in s:
+        return "status-accepted"
+    if "in progress" in s:
+        return "status-pending"
+    if "admissions review" in s or "admission review" in s:
+        return "status-admissions-review"
+    if "application submitted" in s or "submitted" in s:
+        return "status-applied"
+    return ""
+
+
+@dataclass
+class Aggregates:
+    """Counts cube keyed by (status bucket, country, point of entry); every summary is a rollup of it.
+
+    Rows are scanned once; by-status/country/entry counts and acceptance rates are derived
+    from the cube, which has at most buckets x countries x entries cells.
+    """
+
+    cube: Counter = field(default_factory=Counter)
+    _json: str | None = field(default=None, init=False, repr=False)
+
+    @classmethod
+    def from_rows(cls, rows: list[dict]) -> "Aggregates":
+        cube = Counter()
+        buckets: dict[str, str] = {}
+        for row in rows:
+            status = row.get("application_status") or ""
+            bucket = buckets.get(status)
+            if bucket is None:
+                bucket = buckets[status] = status_to_row_class(status)
+            cube[(bucket, (row.get("country") or "").strip(), (row.get("point_of_entry") or "").strip())] += 1
+        return cls(cube)
+
+    @property
+    def total(self) -> int:
+        return sum(self.cube.values())
+
+    def _rollup(self, axis: int) -> Counter:
+        out = Counter()
+        for key, n in self.cube.items():
+            out[key[axis]] += n
+        return out
+
+    def by_status(self) -> dict[str, int]:
+        counts = self._rollup(0)
+        return {label: counts[b] for b, label in STATUS_BUCKETS.items() if counts[b]}
+
+    def by_country(self) -> dict[str, int]:
+        return dict(sorted(self._rollup(1).items(), key=lambda kv: (-kv[1], kv[0].lower())))
+
+    def by_entry(self) -> dict[str, int]:
+        return dict(sorted(self._rollup(2).items(), key=lambda kv: (-kv[1], kv[0].lower())))
+
+    def acceptance_by_country(self) -> dict[str, dict]:
+        """Per country: accepted, rejected, decided (= accepted + rejected) and rate = accepted / decided."""
+        out: dict[str, dict] = {}
+        for (bucket, country, _), n in self.cube.items():
+            c = out.setdefault(country, {"total": 0, "accepted": 0, "rejected": 0})
+            c["total"] += n
+            if bucket == "status-accepted":
+                c["accepted"] += n
+            elif bucket == "rejected":
+                c["rejected"] += n
+        for c in out.values():
+            decided = c["accepted"] + c["rejected"]
+            c["decided"] = decided
+            c["rate"] = round(c["accepted"] / decided, 4) if decided else None
+        return dict(sorted(out.items(), key=lambda kv: (-kv[1]["total"], kv[0].lower())))
+
+    def to_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "by_status": self.by_status(),
+            "by_country": self.by_country(),
+            "by_point_of_entry": self.by_entry(),
+            "acceptance_by_country": self.acceptance_by_country(),
+        }
+
+    def to_json(self) -> str:
+        """JSON body for /stats.json; serialized once and reused for every request."""
+        if self._json is None:
+            self._json = json.dumps(self.to_dict(), separators=(",", ":"))
+        return self._json
@@ -0,0 +1,81 @@
+"""Checks for the iCalendar export: deadline parsing, line folding and injection-safe output.
+
+Run:  python -m pytest -q test_export.py
+"""
+
+from datetime import date
+
+import pytest
+
+from export import _ics_line, iter_ics, parse_deadline
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2027-01-15", date(2027, 1, 15)),
+    ("2027/01/15", date(2027, 1, 15)),
+    ("15.01.2027", date(2027, 1, 15)),
+    ("January 15th, 2027", date(2027, 1, 15)),
+    ("1st Mar 2027", date(2027, 3, 1)),
+    ("15-Jan-2027", date(2027, 1, 15)),
+    # Ambiguous slash dates are read day-first; month-first only when day-first is impossible
+    ("03/04/2027", date(2027, 4, 3)),
+    ("12/25/2027", date(2027, 12, 25)),
+    ("  2027-01-15 ", date(2027, 1, 15)),
+])
+def test_parse_deadline(value, expected):
+    assert parse_deadline(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "TBA", "rolling", "2027-02-30", "31/31/2027"])
+def test_parse_deadline_rejects_non_dates(value):
+    assert parse_deadline(value) is None
+
+
+def _unfold(folded: str) -> str:
+    return folded.removesuffix("\r\n").replace("\r\n ", "")
+
+
+@pytest.mark.parametrize("line", [
+    "SUMMARY:short",
+    "SUMMARY:" + "a" * 67,
+    "SUMMARY:" + "a" * 300,
+    # Multi-byte characters straddling every fold position
+    "SUMMARY:" + "é" * 100,
+    "SUMMARY:a" + "漢字" * 60,
+    "SUMMARY:" + "🎓" * 40,
+])
+def test_ics_line_folds_on_octets_without_splitting_characters(line):
+    folded = _ics_line(line)
+    assert folded.endswith("\r\n")
+    assert _unfold(folded) == line
+    for physical in folded.removesuffix("\r\n").split("\r\n"):
+        assert len(physical.encode("utf-8")) <= 75
+
+
+def _calendar(rows) -> str:
+    return b"".join(iter_ics(rows, loaded_at=0)).decode("utf-8")
+
+
+def test_ics_cells_cannot_inject_lines():
+    row = {
+        "university": "Evil U\rBEGIN:VEVENT",
+        "program": "CS\nEND:VCALENDAR",
+        "deadline": "2027-01-15",
+        "link": "https://example.org/\r\nBEGIN:VALARM",
+    }
+    text = _calendar([row])
+    lines = text.split("\r\n")
+    assert "\r" not in text.replace("\r\n", "") and "\n" not in text.replace("\r\n", "")
+    assert lines.count("BEGIN:VEVENT") == 1
+    assert "BEGIN:VALARM" not in lines
+    assert "URL:https://example.org/BEGIN:VALARM" in lines
+
+
+def test_ics_duplicate_rows_get_distinct_uids():
+    row = {"university": "ETH", "program": "MSc", "deadline": "2027-01-15"}
+    other = {"university": "EPFL", "program": "MSc", "deadline": "2027-02-01"}
+    uids = [line for line in _calendar([row, dict(row), other, dict(row)]).split("\r\n") if line.startswith("UID:")]
+    assert len(uids) == 4 and len(set(uids)) == 4
+    # The first copy keeps the UID it would have on its own
+    assert uids[0] in _calendar([row])
+    assert _calendar([]).count("UID:") == 0
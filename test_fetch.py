@@ -0,0 +1,160 @@
+"""Fault-injection checks for fetch.py and the loader fallbacks, against a local stand-in server.
+
+Run:  python -m pytest -q test_fetch.py
+"""
+
+import gzip
+import http.server
+import threading
+
+import pytest
+
+import fetch
+import sheet_loader
+from fetch import CircuitBreaker, ConnectionPool, CorruptBodyError, FetchError, SheetFetcher
+
+CSV = b"University,Country\nETH,Switzerland\n"
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def upstream():
+    """Server answering each GET with the next queued mode (default: good CSV)."""
+    plan: list[str] = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            mode = plan.pop(0) if plan else "ok"
+            headers = {}
+            if mode == "500":
+                status, body = 500, b""
+            elif mode == "bad_gzip":
+                status, body = 200, gzip.compress(CSV)[:-12]
+                headers["Content-Encoding"] = "gzip"
+            elif mode == "huge_field":
+                status, body = 200, b"University\n" + b"x" * 200_000 + b"\n"
+            else:
+                status, body = 200, CSV
+            self.send_response(status)
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/export", plan
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _fetcher(clock: _Clock, max_attempts: int = 1) -> SheetFetcher:
+    return SheetFetcher(
+        pool=ConnectionPool(timeout=2),
+        breaker=CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock),
+        max_attempts=max_attempts,
+        sleep=lambda s: None,
+    )
+
+
+def test_retries_then_succeeds(upstream):
+    url, plan = upstream
+    f = _fetcher(_Clock(), max_attempts=3)
+    plan[:] = ["500", "500"]
+    assert f.fetch_text(url) == CSV.decode()
+    m = f.metrics()
+    assert m["http_5xx"] == 2 and m["retries"] == 2 and m["fetch_ok"] == 1
+
+
+def test_corrupt_gzip_is_a_fetch_error(upstream):
+    url, plan = upstream
+    f = _fetcher(_Clock())
+    plan[:] = ["bad_gzip"]
+    with pytest.raises(CorruptBodyError):
+        f.fetch_text(url)
+    assert f.metrics()["corrupt_body"] == 1
+
+
+def test_failed_half_open_probe_reopens_and_recovers(upstream):
+    url, plan = upstream
+    clock = _Clock()
+    f = _fetcher(clock)
+    plan[:] = ["500", "500"]
+    for _ in range(2):
+        with pytest.raises(FetchError):
+            f.fetch_text(url)
+    assert f.breaker.state == "open"
+    with pytest.raises(fetch.CircuitOpenError):
+        f.fetch_text(url)
+
+    clock.now += 10
+    plan[:] = ["bad_gzip"]
+    with pytest.raises(CorruptBodyError):
+        f.fetch_text(url)
+    assert f.breaker.state == "open"
+
+    clock.now += 10
+    assert f.fetch_text(url) == CSV.decode()
+    assert f.breaker.state == "closed"
+
+
+def test_unexpected_error_during_probe_does_not_wedge_breaker(upstream, monkeypatch):
+    url, _ = upstream
+    clock = _Clock()
+    f = _fetcher(clock)
+    f.breaker.record_failure()
+    f.breaker.record_failure()
+    clock.now += 10
+
+    def boom(url):
+        raise ValueError("unexpected")
+
+    monkeypatch.setattr(f, "_get_once", boom)
+    with pytest.raises(ValueError):
+        f.fetch_text(url)
+    assert f.breaker.state == "open"
+    assert f.metrics()["unexpected_error"] == 1
+
+    monkeypatch.undo()
+    clock.now += 10
+    assert f.fetch_text(url) == CSV.decode()
+    assert f.breaker.state == "closed"
+
+
+def test_bad_upstream_keeps_last_good_rows(upstream, monkeypatch):
+    url, plan = upstream
+    monkeypatch.setattr(sheet_loader, "SHEET_CSV_URL", url)
+    monkeypatch.setattr(fetch, "_fetcher", _fetcher(_Clock()))
+    monkeypatch.setattr(sheet_loader, "_dataset", None)
+
+    good = sheet_loader.get_dataset(use_local_fallback=False, max_age=0)
+    assert [r["university"] for r in good.rows] == ["ETH"]
+
+    for mode in ("bad_gzip", "huge_field"):
+        plan[:] = [mode]
+        assert sheet_loader.get_dataset(use_local_fallback=False, max_age=0) is good
+    assert fetch.fetch_metrics()["unparseable_csv"] == 1
+
+
+def test_unparseable_csv_falls_back_to_local_export(upstream, monkeypatch, tmp_path):
+    url, plan = upstream
+    local = tmp_path / "export.csv"
+    local.write_text("University,Country\nLocal U,Norway\n", encoding="utf-8")
+    monkeypatch.setattr(sheet_loader, "SHEET_CSV_URL", url)
+    monkeypatch.setattr(sheet_loader, "LOCAL_CSV_PATH", str(local))
+    monkeypatch.setattr(fetch, "_fetcher", _fetcher(_Clock()))
+    plan[:] = ["huge_field"]
+    assert [r["university"] for r in sheet_loader.load_scholarships()] == ["Local U"]
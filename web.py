@@ -1,8 +1,12 @@
 """Web view: build HTML for Scholarship Application Tracker with filters."""
 
+import base64
 import html
+import json
 
-from sheet_loader import load_scholarships
+from search import mask_to_bytes, mask_to_ids
+from sheet_loader import Dataset, get_dataset
+from stats import STATUS_BUCKETS, status_to_row_class as _status_to_row_class
 
 
 def _esc(s: str) -> str:
@@ -13,60 +17,167 @@ def _unique_sorted(values: set[str]) -> list[str]:
     return sorted((v for v in values if v), key=str.lower)
 
 
-def _status_to_row_class(status: str) -> str:
-    """Map application status to a CSS class. Statuses: Accepted, Admissions Review, Application Submitted, Rejected, In Progress."""
-    s = (status or "").strip().lower()
-    if not s:
+def _resolve_dataset(scholarships: list[dict] | None, dataset: Dataset | None) -> Dataset:
+    if dataset is not None:
+        return dataset
+    if scholarships is not None:
+        return Dataset(scholarships)
+    return get_dataset(use_local_fallback=True)
+
+
+def search_json(query: str, scholarships: list[dict] | None = None, dataset: Dataset | None = None) -> str:
+    """JSON body for /search?q=: match count plus a base64 bitmap of matching row ids (data-idx),
+    for the given dataset version. About n/6 bytes for n rows, however broad the query."""
+    dataset = _resolve_dataset(scholarships, dataset)
+    size = len(dataset.rows)
+    matched = dataset.index.search(query)
+    mask = (1 << size) - 1 if matched is None else matched
+    return json.dumps(
+        {
+            "query": query,
+            "version": dataset.version,
+            "count": mask.bit_count(),
+            "mask": base64.b64encode(mask_to_bytes(mask, size)).decode("ascii"),
+        },
+        separators=(",", ":"),
+    )
+
+
+def stats_json(scholarships: list[dict] | None = None, dataset: Dataset | None = None) -> str:
+    """JSON body for /stats.json (aggregates are computed and serialized once per refresh)."""
+    return _resolve_dataset(scholarships, dataset).stats.to_json()
+
+
+def page_bytes(dataset: Dataset) -> bytes:
+    """UTF-8 page without a search query; rendered once per dataset refresh."""
+    cached = dataset.memo.get("page")
+    if cached is None:
+        cached = dataset.memo["page"] = build_html(dataset=dataset).encode("utf-8")
+    return cached
+
+
+def _format_rate(rate: float | None) -> str:
+    return "—" if rate is None else f"{rate * 100:.0f}%"
+
+
+def _dashboard_html(dataset: Dataset) -> str:
+    """Summary section (counts + acceptance rate), rendered once per dataset refresh."""
+    cached = dataset.memo.get("dashboard_html")
+    if cached is not None:
+        return cached
+    stats = dataset.stats
+    if not stats.total:
+        dataset.memo["dashboard_html"] = ""
         return ""
-    if "rejected" in s:
-        return "rejected"
-    if "accepted" in s:
-        return "status-accepted"
-    if "in progress" in s:
-        return "status-pending"
-    if "admissions review" in s or "admission review" in s:
-        return "status-admissions-review"
-    if "application submitted" in s or "submitted" in s:
-        return "status-applied"
-    return ""
-
-
-def build_html(scholarships: list[dict] | None = None) -> str:
-    if scholarships is None:
-        scholarships = load_scholarships(use_local_fallback=True)
+    label_to_class = {label: cls for cls, label in STATUS_BUCKETS.items()}
+    status_chips = "".join(
+        f'<span class="stat-chip {label_to_class[label]}">{_esc(label)} <strong>{n}</strong></span>'
+        for label, n in stats.by_status().items()
+    )
+    entry_chips = "".join(
+        f'<span class="stat-chip">{_esc(entry) or "—"} <strong>{n}</strong></span>'
+        for entry, n in stats.by_entry().items()
+    )
+    country_rows = "".join(
+        f'<tr><td data-label="Country">{_esc(country) or "—"}</td><td data-label="Applications">{c["total"]}</td>'
+        f'<td data-label="Accepted">{c["accepted"]}</td><td data-label="Rejected">{c["rejected"]}</td>'
+        f'<td data-label="Acceptance rate">{_format_rate(c["rate"])}</td></tr>'
+        for country, c in stats.acceptance_by_country().items()
+    )
+    out = f"""<details class="dashboard">
+      <summary>Summary <span class="dashboard__total">{stats.total} applications</span></summary>
+      <div class="dashboard__group"><h2>By status</h2><div class="stat-chips">{status_chips}</div></div>
+      <div class="dashboard__group"><h2>By point of entry</h2><div class="stat-chips">{entry_chips}</div></div>
+      <div class="dashboard__group"><h2>By country</h2>
+        <div class="table-wrap"><table class="dashboard__table">
+          <thead><tr><th>Country</th><th>Applications</th><th>Accepted</th><th>Rejected</th><th>Acceptance rate</th></tr></thead>
+          <tbody>{country_rows}</tbody>
+        </table></div>
+      </div>
+    </details>"""
+    dataset.memo["dashboard_html"] = out
+    return out
 
+
+def _filter_options(dataset: Dataset) -> tuple[str, str, str]:
+    cached = dataset.memo.get("filter_options")
+    if cached is not None:
+        return cached
+    scholarships = dataset.rows
     statuses = _unique_sorted({s.get("application_status") or "" for s in scholarships})
     countries = _unique_sorted({s.get("country") or "" for s in scholarships})
     entries = _unique_sorted({s.get("point_of_entry") or "" for s in scholarships})
+    # Only non-empty values in filters; "All" is in the template, no dash option
+    status_options = "".join(f'<option value="{_esc(x)}">{_esc(x)}</option>' for x in statuses)
+    country_options = "".join(f'<option value="{_esc(x)}">{_esc(x)}</option>' for x in countries)
+    entry_options = "".join(f'<option value="{_esc(x)}">{_esc(x)}</option>' for x in entries)
+    out = dataset.memo["filter_options"] = (status_options, country_options, entry_options)
+    return out
+
+
+def _rows_html(dataset: Dataset, matched: set[int] | None = None) -> str:
+    """Table rows. Repeated (interned) values are escaped / classified once per dataset via dataset.memo."""
+    # value -> _esc(value); value -> _esc(_esc(value)) for data-* attributes; status -> CSS class
+    esc_memo = dataset.memo.setdefault("esc", {})
+    attr_memo = dataset.memo.setdefault("attr", {})
+    class_memo = dataset.memo.setdefault("status_class", {})
+
+    def esc(value):
+        out = esc_memo.get(value)
+        if out is None:
+            out = esc_memo[value] = _esc(value)
+        return out
+
+    def attr(value):
+        out = attr_memo.get(value)
+        if out is None:
+            out = attr_memo[value] = _esc(esc(value))
+        return out
 
     rows = []
-    for s in scholarships:
-        uni = _esc(s.get("university"))
+    for idx, s in enumerate(dataset.rows):
+        uni = esc(s.get("university"))
         program = _esc(s.get("program"))
         scholarship = _esc(s.get("scholarship"))
-        deadline = _esc(s.get("deadline"))
-        app_date = _esc(s.get("application_date"))
-        status = _esc(s.get("application_status"))
-        entry = _esc(s.get("point_of_entry"))
-        country = _esc(s.get("country"))
+        deadline = esc(s.get("deadline"))
+        app_date = esc(s.get("application_date"))
+        raw_status = s.get("application_status") or ""
+        status = esc(raw_status)
+        entry = esc(s.get("point_of_entry"))
+        country = esc(s.get("country"))
         link = (s.get("link") or "").strip()
         link_cell = f'<a href="{_esc(link)}" target="_blank" rel="noopener">Link</a>' if link else "—"
-        status_class = _status_to_row_class(s.get("application_status") or "")
+        status_class = class_memo.get(raw_status)
+        if status_class is None:
+            status_class = class_memo[raw_status] = _status_to_row_class(raw_status)
+        if matched is not None and idx not in matched:
+            status_class = f"{status_class} hidden".strip()
         row_class = f' class="{status_class}"' if status_class else ""
-        data_attr = f' data-status="{_esc(status)}" data-country="{_esc(country)}" data-entry="{_esc(entry)}"'
+        data_attr = f' data-idx="{idx}" data-status="{attr(raw_status)}" data-country="{attr(s.get("country"))}" data-entry="{attr(s.get("point_of_entry"))}"'
         rows.append(
             f'<tr{row_class}{data_attr}>'
             f'<td data-label="University">{uni}</td><td data-label="Program">{program}</td><td data-label="Scholarship">{scholarship}</td>'
             f'<td data-label="Deadline">{deadline}</td><td data-label="Application date">{app_date}</td><td data-label="Status">{status}</td>'
             f'<td data-label="Point of Entry">{entry}</td><td data-label="Country">{country}</td><td data-label="Link">{link_cell}</td></tr>'
         )
+    return "\n".join(rows)
 
-    body = "\n".join(rows) if rows else '<tr><td colspan="9">No scholarships yet. Share the sheet as &quot;Anyone with the link can view&quot;.</td></tr>'
 
-    # Only non-empty values in filters; "All" is in the template, no dash option
-    status_options = "".join(f'<option value="{_esc(x)}">{_esc(x)}</option>' for x in statuses)
-    country_options = "".join(f'<option value="{_esc(x)}">{_esc(x)}</option>' for x in countries)
-    entry_options = "".join(f'<option value="{_esc(x)}">{_esc(x)}</option>' for x in entries)
+def build_html(
+    scholarships: list[dict] | None = None,
+    query: str = "",
+    dataset: Dataset | None = None,
+) -> str:
+    dataset = _resolve_dataset(scholarships, dataset)
+    query = (query or "").strip()
+    matched = dataset.index.search(query)
+    if matched is not None:
+        matched = set(mask_to_ids(matched))
+
+    body = _rows_html(dataset, matched) or '<tr><td colspan="9">No scholarships yet. Share the sheet as &quot;Anyone with the link can view&quot;.</td></tr>'
+
+    dashboard = _dashboard_html(dataset)
+    status_options, country_options, entry_options = _filter_options(dataset)
 
     return f"""<!DOCTYPE html>
 <html lang="en">
@@ -184,6 +295,26 @@ def build_html(scholarships: list[dict] | None = None) -> str:
     .filter-dropdown__trigger[aria-expanded="true"] .filter-dropdown__arrow {{
       transform: rotate(180deg);
     }}
+    .search-box input {{
+      width: 100%;
+      min-height: 44px;
+      padding: 0.6rem 0.75rem;
+      border-radius: 12px;
+      border: 1px solid #cbd5e1;
+      background: #ffffff;
+      color: #1e293b;
+      font-family: inherit;
+      font-size: 1rem;
+      transition: border-color 0.2s, box-shadow 0.2s;
+    }}
+    .search-box input:hover {{
+      border-color: #94a3b8;
+    }}
+    .search-box input:focus {{
+      outline: none;
+      border-color: #0284c7;
+      box-shadow: 0 0 0 3px rgba(2, 132, 199, 0.2);
+    }}
     .filter-dropdown__list {{
       position: absolute;
       top: calc(100% + 4px);
@@ -230,6 +361,48 @@ def build_html(scholarships: list[dict] | None = None) -> str:
       background: #cbd5e1;
       border-radius: 3px;
     }}
+    .dashboard {{
+      margin-bottom: clamp(1rem, 3vw, 1.25rem);
+      padding: clamp(0.75rem, 2.5vw, 1rem);
+      background: #ffffff;
+      border-radius: 10px;
+      border: 1px solid #e2e8f0;
+      box-shadow: 0 1px 3px rgba(0, 0, 0, 0.06);
+    }}
+    .dashboard summary {{
+      font-weight: 600;
+      color: #0284c7;
+      cursor: pointer;
+    }}
+    .dashboard__total {{
+      font-weight: 500;
+      color: #64748b;
+      font-size: 0.85rem;
+      margin-left: 0.5rem;
+    }}
+    .dashboard__group {{ margin-top: 0.9rem; }}
+    .dashboard h2 {{
+      font-weight: 600;
+      font-size: 0.75rem;
+      color: #64748b;
+      text-transform: uppercase;
+      letter-spacing: 0.04em;
+      margin: 0 0 0.45rem 0;
+    }}
+    .stat-chips {{ display: flex; flex-wrap: wrap; gap: 0.5rem; }}
+    .stat-chip {{
+      padding: 0.3rem 0.65rem;
+      border-radius: 999px;
+      border: 1px solid #e2e8f0;
+      background: #f8fafc;
+      font-size: 0.85rem;
+    }}
+    .stat-chip.rejected {{ background: #fef2f2; color: #b91c1c; border-color: #fecaca; }}
+    .stat-chip.status-accepted {{ background: #f0fdf4; color: #166534; border-color: #bbf7d0; }}
+    .stat-chip.status-pending {{ background: #fffbeb; color: #b45309; border-color: #fde68a; }}
+    .stat-chip.status-admissions-review {{ background: #f5f3ff; color: #5b21b6; border-color: #ddd6fe; }}
+    .stat-chip.status-applied {{ background: #eff6ff; color: #1e40af; border-color: #bfdbfe; }}
+    .table-wrap table.dashboard__table {{ min-width: 0; }}
     .count {{
       color: #64748b;
       font-size: clamp(0.8rem, 2vw, 0.85rem);
@@ -316,6 +489,7 @@ def build_html(scholarships: list[dict] | None = None) -> str:
       .filters {{ flex-direction: column; align-items: stretch; gap: 0.75rem; }}
       .filters > div {{ min-width: 0; }}
       .filter-dropdown__trigger {{ min-height: 48px; font-size: 16px; }}
+      .search-box input {{ min-height: 48px; font-size: 16px; }}
       .filter-dropdown__option {{ padding: 0.65rem 0.75rem; min-height: 44px; }}
       .filter-dropdown__list {{ max-height: min(260px, 50vh); }}
       .count {{ flex-basis: auto; padding-top: 0; }}
@@ -393,7 +567,12 @@ def build_html(scholarships: list[dict] | None = None) -> str:
 <body>
   <div class="wrap">
     <h1>Scholarship Application Tracker</h1>
+    {dashboard}
     <div class="filters">
+      <div class="search-box">
+        <label for="search">Search</label>
+        <input type="search" id="search" name="q" value="{_esc(query)}" placeholder="University, program, scholarship, country" autocomplete="off" data-version="{dataset.version}">
+      </div>
       <div class="filter-dropdown">
         <label for="filter-status-trigger">Status</label>
         <select id="filter-status" aria-hidden="true" tabindex="-1"><option value="">All</option>{status_options}</select>
@@ -412,7 +591,7 @@ def build_html(scholarships: list[dict] | None = None) -> str:
         <button type="button" id="filter-entry-trigger" class="filter-dropdown__trigger" aria-haspopup="listbox" aria-expanded="false"><span class="filter-dropdown__label">All</span><span class="filter-dropdown__arrow" aria-hidden="true"><svg xmlns="http://www.w3.org/2000/svg" width="12" height="12" fill="currentColor" viewBox="0 0 16 16"><path d="M8 11L3 6h10l-5 5z"/></svg></span></button>
         <div id="filter-entry-list" class="filter-dropdown__list" role="listbox" hidden></div>
       </div>
-      <span class="count" id="visible-count"></span>
+      <span class="count"><span class="data-notice" id="data-notice" hidden>Data updated · <a href="">Reload</a> · </span><span id="visible-count"></span></span>
     </div>
     <div class="table-wrap">
       <table>
@@ -433,6 +612,15 @@ def build_html(scholarships: list[dict] | None = None) -> str:
       var countrySel = document.getElementById('filter-country');
       var entrySel = document.getElementById('filter-entry');
       var countEl = document.getElementById('visible-count');
+      var searchEl = document.getElementById('search');
+      // null = no search; otherwise row idx -> true for rows matching the search box
+      var searchIds = null;
+      if (searchEl && searchEl.value.trim()) {{
+        searchIds = {{}};
+        for (var k = 0; k < rows.length; k++) {{
+          if (!rows[k].classList.contains('hidden')) searchIds[rows[k].getAttribute('data-idx')] = true;
+        }}
+      }}
 
       var dropdowns = [
         {{ sel: statusSel, trigger: document.getElementById('filter-status-trigger'), list: document.getElementById('filter-status-list') }},
@@ -511,7 +699,8 @@ def build_html(scholarships: list[dict] | None = None) -> str:
           var r = rows[i];
           var match = (!status || r.getAttribute('data-status') === status) &&
                       (!country || r.getAttribute('data-country') === country) &&
-                      (!entry || r.getAttribute('data-entry') === entry);
+                      (!entry || r.getAttribute('data-entry') === entry) &&
+                      (!searchIds || searchIds[r.getAttribute('data-idx')] === true);
           r.classList.toggle('hidden', !match);
           if (match) visible++;
         }}
@@ -521,6 +710,83 @@ def build_html(scholarships: list[dict] | None = None) -> str:
       if (statusSel) statusSel.addEventListener('change', update);
       if (countrySel) countrySel.addEventListener('change', update);
       if (entrySel) entrySel.addEventListener('change', update);
+
+      var noticeEl = document.getElementById('data-notice');
+      var rowTokens = null;
+      function tokenize(text) {{
+        return text.normalize('NFKD').replace(/[\\u0300-\\u036f]/g, '').toLowerCase().match(/[\\p{{L}}\\p{{N}}_]+/gu) || [];
+      }}
+      // Fallback when /search cannot answer for this page: prefix match on the searchable cells
+      function localSearch(q) {{
+        if (!rowTokens) {{
+          rowTokens = [];
+          for (var i = 0; i < rows.length; i++) {{
+            var cells = rows[i].cells;
+            rowTokens.push(tokenize([cells[0], cells[1], cells[2], cells[7]].map(function(c) {{ return c ? c.textContent : ''; }}).join(' ')));
+          }}
+        }}
+        var terms = tokenize(q);
+        var ids = {{}};
+        for (var j = 0; j < rows.length; j++) {{
+          var toks = rowTokens[j];
+          var ok = terms.every(function(t) {{
+            return toks.some(function(tok) {{ return tok.lastIndexOf(t, 0) === 0; }});
+          }});
+          if (ok) ids[rows[j].getAttribute('data-idx')] = true;
+        }}
+        return ids;
+      }}
+
+      var searchTimer = null;
+      var searchSeq = 0;
+      function runSearch() {{
+        var q = searchEl.value.trim();
+        var seq = ++searchSeq;
+        var url = new URL(window.location.href);
+        if (q) url.searchParams.set('q', q); else url.searchParams.delete('q');
+        history.replaceState(null, '', url);
+        if (!q) {{
+          searchIds = null;
+          update();
+          return;
+        }}
+        fetch('/search?q=' + encodeURIComponent(q))
+          .then(function(res) {{ return res.json(); }})
+          .then(function(data) {{
+            if (seq !== searchSeq) return;
+            // Sheet changed since this page rendered: row ids no longer line up, so filter
+            // the rows on the page here and offer a reload instead of reloading mid-typing
+            if (data.version !== searchEl.getAttribute('data-version')) {{
+              if (noticeEl) noticeEl.removeAttribute('hidden');
+              searchIds = localSearch(q);
+            }} else {{
+              var bits = atob(data.mask);
+              searchIds = {{}};
+              for (var i = 0; i < rows.length; i++) {{
+                var idx = +rows[i].getAttribute('data-idx');
+                if (bits.charCodeAt(idx >> 3) & (1 << (idx & 7))) searchIds[idx] = true;
+              }}
+            }}
+            update();
+          }})
+          .catch(function() {{
+            if (seq !== searchSeq) return;
+            searchIds = localSearch(q);
+            update();
+          }});
+      }}
+      if (searchEl) {{
+        searchEl.addEventListener('input', function() {{
+          clearTimeout(searchTimer);
+          searchTimer = setTimeout(runSearch, 200);
+        }});
+        // A prerendered page (static hosting) ignores ?q=; apply a deep-linked search here
+        var linked = new URL(window.location.href).searchParams.get('q');
+        if (linked && !searchEl.value.trim()) {{
+          searchEl.value = linked;
+          runSearch();
+        }}
+      }}
       update();
     }})();
   </script>